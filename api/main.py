@@ -1,6 +1,8 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Any, Dict
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -16,11 +18,12 @@ from src.document_analyzer.data_analysis import DocumentAnalyzer
 from src.document_compare.document_comparator import DocumentComparatorLLM
 from src.document_chat.retrieval import ConversationalRAG
 from utils.document_ops import FastAPIFileAdapter,read_pdf_via_handler
+from utils.model_loader import preload_models
 from logger import GLOBAL_LOGGER as log
 
 FAISS_BASE = os.getenv("FAISS_BASE", "faiss_index")
 UPLOAD_BASE = os.getenv("UPLOAD_BASE", "data")
-FAISS_INDEX_NAME = os.getenv("FAISS_INDEX_NAME", "index")  # <--- keep consistent with save_local()
+FAISS_INDEX_NAME = os.getenv("FAISS_INDEX_NAME", "index")  # <--- keep consistent with save_vectorstore()
 
 app = FastAPI(title="Document Portal API", version="0.1")
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -35,6 +38,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def _init_pdf_pool() -> None:
+    # Long-lived workers (MuPDF already imported) shared by all PDF reads
+    app.state.pdf_pool = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 6))
+    log.info("PDF worker pool started")
+
+@app.on_event("startup")
+def _preload_models() -> None:
+    # Build the shared embedding / LLM clients now instead of inside the first request
+    try:
+        preload_models()
+        log.info("Models preloaded")
+    except Exception as e:
+        # Not fatal: the first request that needs a model retries and reports the error
+        log.warning("Model preload failed", error=str(e))
+
+@app.on_event("shutdown")
+def _shutdown_pdf_pool() -> None:
+    app.state.pdf_pool.shutdown(wait=False)
+    log.info("PDF worker pool stopped")
+
 @app.get("/", response_class=HTMLResponse)
 async def serve_ui(request: Request):
     log.info("Serving UI homepage.")
@@ -52,11 +76,12 @@ def health() -> Dict[str, str]:
 async def analyze_document(file: UploadFile = File(...)) -> Any:
     try:
         log.info(f"Received file for analysis: {file.filename}")
+        # blocking disk / PyMuPDF / LLM work runs in the threadpool to keep the event loop free
         dh = DocHandler()
-        saved_path = dh.save_pdf(FastAPIFileAdapter(file))
-        text = read_pdf_via_handler(dh, saved_path)
-        analyzer = DocumentAnalyzer()
-        result = analyzer.analyze_document(text)
+        saved_path = await run_in_threadpool(dh.save_pdf, FastAPIFileAdapter(file))
+        text = await run_in_threadpool(read_pdf_via_handler, dh, saved_path, executor=app.state.pdf_pool)
+        analyzer = await run_in_threadpool(DocumentAnalyzer)
+        result = await run_in_threadpool(analyzer.analyze_document, text)
         log.info("Document analysis complete.")
         return JSONResponse(content=result)
     except HTTPException:
@@ -71,13 +96,13 @@ async def compare_documents(reference: UploadFile = File(...), actual: UploadFil
     try:
         log.info(f"Comparing files: {reference.filename} vs {actual.filename}")
         dc = DocumentComparator()
-        ref_path, act_path = dc.save_uploaded_files(
-            FastAPIFileAdapter(reference), FastAPIFileAdapter(actual)
+        ref_path, act_path = await run_in_threadpool(
+            dc.save_uploaded_files, FastAPIFileAdapter(reference), FastAPIFileAdapter(actual)
         )
         _ = ref_path, act_path
-        combined_text = dc.combine_documents()
-        comp = DocumentComparatorLLM()
-        df = comp.compare_documents(combined_text)
+        combined_text = await run_in_threadpool(dc.combine_documents, app.state.pdf_pool)
+        comp = await run_in_threadpool(DocumentComparatorLLM)
+        df = await run_in_threadpool(comp.compare_documents, combined_text)
         log.info("Document comparison completed.")
         return {"rows": df.to_dict(orient="records"), "session_id": dc.session_id}
     except HTTPException:
@@ -101,16 +126,17 @@ async def chat_build_index(
         wrapped = [FastAPIFileAdapter(f) for f in files]
         # this is my main class for storing a data into VDB
         # created a object of ChatIngestor
-        ci = ChatIngestor(
+        ci = await run_in_threadpool(
+            ChatIngestor,
             temp_base=UPLOAD_BASE,
             faiss_base=FAISS_BASE,
             use_session_dirs=use_session_dirs,
             session_id=session_id or None,
         )
         # NOTE: ensure your ChatIngestor saves with index_name="index" or FAISS_INDEX_NAME
-        # e.g., if it calls FAISS.save_local(dir, index_name=FAISS_INDEX_NAME)
-        ci.built_retriver(  # if your method name is actually build_retriever, fix it there as well
-            wrapped, chunk_size=chunk_size, chunk_overlap=chunk_overlap, k=k
+        # e.g., if it calls save_vectorstore(vs, dir, index_name=FAISS_INDEX_NAME)
+        await run_in_threadpool(  # if your method name is actually build_retriever, fix it there as well
+            ci.built_retriver, wrapped, chunk_size=chunk_size, chunk_overlap=chunk_overlap, k=k
         )
         log.info(f"Index created successfully for session: {ci.session_id}")
         return {"session_id": ci.session_id, "k": k, "use_session_dirs": use_session_dirs}
@@ -137,9 +163,11 @@ async def chat_query(
         if not os.path.isdir(index_dir):
             raise HTTPException(status_code=404, detail=f"FAISS index not found at: {index_dir}")
 
-        rag = ConversationalRAG(session_id=session_id)
-        rag.load_retriever_from_faiss(index_dir, k=k, index_name=FAISS_INDEX_NAME)  # build retriever + chain
-        response = rag.invoke(question, chat_history=[])
+        rag = await run_in_threadpool(ConversationalRAG, session_id=session_id)
+        await run_in_threadpool(  # build retriever + chain
+            rag.load_retriever_from_faiss, index_dir, k=k, index_name=FAISS_INDEX_NAME
+        )
+        response = await run_in_threadpool(rag.invoke, question, chat_history=[])
         log.info("Chat query handled successfully.")
 
         return {
@@ -1,6 +1,5 @@
 import streamlit as st
 from pathlib import Path
-from langchain_community.vectorstores import FAISS
 
 # === Importing modules here ===
 from archive.src.document_analyzer.data_ingestion import DocumentHandler
@@ -9,7 +8,7 @@ from archive.src.single_document_chat.data_ingestion import SingleDocIngestor
 from archive.src.single_document_chat.retrieval import ConversationalRAG as SingleDocRAG
 from archive.src.multi_document_chat.data_ingestion import DocumentIngestor
 from archive.src.multi_document_chat.retrieval import ConversationalRAG as MultiDocRAG
-from utils.model_loader import ModelLoader
+from src.document_chat.retrieval import get_vectorstore
 
 FAISS_INDEX_PATH = Path("faiss_index")
 
@@ -52,16 +51,10 @@ with tab2:
 
     if single_pdf and question and st.button("Get Answer", key="single_answer_btn"):
         try:
-            model_loader = ModelLoader()
-
             # Load existing FAISS index or create a new one
             if FAISS_INDEX_PATH.exists():
-                embeddings = model_loader.load_embeddings()
-                vectorstore = FAISS.load_local(
-                    folder_path=str(FAISS_INDEX_PATH),
-                    embeddings=embeddings,
-                    allow_dangerous_deserialization=True
-                )
+                # Process-wide cache, reloaded only when the index files change (survives reruns)
+                vectorstore = get_vectorstore(str(FAISS_INDEX_PATH))
                 retriever = vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": 5})
             else:
                 ingestor = SingleDocIngestor()
@@ -67,7 +67,7 @@ class DocumentComparator:
                     if text.strip():
                         all_text.append(f"\n --- page {page_num} ---\n{text}")
                 self.log.info("PDF read successfully", file= str(pdf_path), pages= len(all_text))
-                return "/n".join(all_text)
+                return "\n".join(all_text)
 
         except Exception as e:
             self.log.error("Error reading PDF file: {}".format(e))
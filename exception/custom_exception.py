@@ -1,6 +1,27 @@
 import sys
 import traceback
-from typing import Optional, cast
+from collections import deque
+from functools import cached_property
+from types import CodeType, TracebackType
+from typing import Dict, List, Optional, Tuple, cast
+
+TRACEBACK_FRAME_LIMIT = 15  # innermost frames kept when formatting a traceback
+
+# Formatted "File ..., line ..." entries keyed by (code object, bytecode offset).
+# Code objects live for the whole process, so the same raise site is formatted once.
+_frame_fmt_cache: Dict[Tuple[CodeType, int], str] = {}
+
+
+def _format_tb_entry(tb: TracebackType) -> str:
+    """Return the formatted traceback entry for `tb`, reusing a cached copy when possible."""
+    code = tb.tb_frame.f_code
+    key = (code, tb.tb_lasti)
+    text = _frame_fmt_cache.get(key)
+    if text is None:
+        summary = traceback.FrameSummary(code.co_filename, tb.tb_lineno, code.co_name)
+        text = _frame_fmt_cache[key] = "".join(traceback.StackSummary.from_list([summary]).format())
+    return text
+
 
 class DocumentPortalException(Exception):
     """
@@ -16,6 +37,10 @@ class DocumentPortalException(Exception):
         lineno (int): The line number in the file where the error occurred.
         error_message (str): The normalized error message.
         traceback_str (str): A string representation of the full traceback, if available.
+
+    File name, line number and traceback are resolved lazily from the stored
+    exc_info, so exceptions that are caught and re-raised without being
+    printed never pay for traceback formatting.
     """
 
     def __init__(self, error_message, error_details: Optional[object] = None):
@@ -34,9 +59,8 @@ class DocumentPortalException(Exception):
 
         Behavior:
             - Normalizes the error message.
-            - Extracts exception type, value, and traceback.
-            - Walks to the deepest traceback frame to get the actual error location.
-            - Stores file name, line number, and formatted traceback for debugging.
+            - Extracts and stores exception type, value, and traceback.
+            - File name, line number, and formatted traceback are computed on first access.
 
         Raises:
             None directly. But is meant to be raised as a custom error.
@@ -67,22 +91,41 @@ class DocumentPortalException(Exception):
                 exc_type, exc_value, exc_tb = sys.exc_info()
         # ----------------- Core end -------------------
 
-        # Walk to the last frame to report the most relevant location
-        last_tb = exc_tb
-        while last_tb and last_tb.tb_next:
-            last_tb = last_tb.tb_next
-
-        self.file_name = last_tb.tb_frame.f_code.co_filename if last_tb else "<unknown>"
-        self.lineno = last_tb.tb_lineno if last_tb else -1
+        self.exc_type, self.exc_value, self.exc_tb = exc_type, exc_value, exc_tb
         self.error_message = norm_msg
 
-        # Full pretty traceback (if available)
-        if exc_type and exc_tb:
-            self.traceback_str = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
-        else:
-            self.traceback_str = ""
-
-        super().__init__(self.__str__())
+        super().__init__(norm_msg)
+
+    @cached_property
+    def _tb_entries(self) -> List[TracebackType]:
+        """Innermost TRACEBACK_FRAME_LIMIT traceback entries."""
+        entries = deque(maxlen=TRACEBACK_FRAME_LIMIT)
+        tb = self.exc_tb
+        while tb is not None:
+            entries.append(tb)
+            tb = tb.tb_next
+        return list(entries)
+
+    @property
+    def file_name(self) -> str:
+        entries = self._tb_entries
+        return entries[-1].tb_frame.f_code.co_filename if entries else "<unknown>"
+
+    @property
+    def lineno(self) -> int:
+        entries = self._tb_entries
+        return entries[-1].tb_lineno if entries else -1
+
+    @cached_property
+    def traceback_str(self) -> str:
+        """Pretty traceback (if available), limited to the innermost frames."""
+        if not (self.exc_type and self._tb_entries):
+            return ""
+        return "".join([
+            "Traceback (most recent call last):\n",
+            *map(_format_tb_entry, self._tb_entries),
+            *traceback.format_exception_only(self.exc_type, self.exc_value),
+        ])
 
     def __str__(self):
         """
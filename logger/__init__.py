@@ -1,7 +1,13 @@
 # LOGGER/__init__.py
 
+import os
 from .custom_logger import CustomLogger
 
 # Create single shared logger instance
 
-GLOBAL_LOGGER = CustomLogger().get_logger(__name__)
\ No newline at end of file
+GLOBAL_LOGGER = CustomLogger().get_logger(__name__)
+
+
+def get_logger(name: str = __name__):
+    """Return the shared logger tagged with the calling module (no re-configuration)."""
+    return GLOBAL_LOGGER.bind(module=os.path.basename(name))
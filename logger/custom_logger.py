@@ -1,8 +1,67 @@
 import os
+import queue
+import atexit
 import logging
+import logging.handlers
+import threading
+import time
+import orjson
 import structlog
 from datetime import datetime
 
+FILE_BUFFER_SIZE = 64 * 1024  # bytes buffered before the log file is written
+FILE_FLUSH_INTERVAL = 1.0  # max seconds buffered records wait under sustained load
+
+
+def _orjson_dumps(obj, default=None, **_):
+    """JSONRenderer serializer: orjson encodes to bytes, the stdlib handlers expect str."""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that lets a large buffer batch writes instead of flushing per record.
+    WARNING and above are flushed immediately; everything else is flushed by the
+    QueueListener thread via `flush_buffer()` (see `_FlushingQueueListener`).
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=FILE_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+
+    def flush(self):
+        # StreamHandler.emit() flushes after every record; close() still flushes the stream
+        pass
+
+    def flush_buffer(self):
+        """Write the buffered records to the log file."""
+        logging.StreamHandler.flush(self)
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.WARNING:
+            self.flush_buffer()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes buffered handlers whenever the queue drains, and at
+    least every FILE_FLUSH_INTERVAL seconds while it does not.
+    """
+
+    def __init__(self, queue, *handlers, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self._last_flush = time.monotonic()
+
+    def handle(self, record):
+        super().handle(record)
+        now = time.monotonic()
+        if self.queue.empty() or now - self._last_flush >= FILE_FLUSH_INTERVAL:
+            for handler in self.handlers:
+                if isinstance(handler, _BufferedFileHandler):
+                    handler.flush_buffer()
+            self._last_flush = now
+
 
 class CustomLogger:
     """
@@ -12,12 +71,20 @@ class CustomLogger:
     while structuring them in JSON for machine readability and easy integration with
     log aggregators (e.g., ELK stack, Datadog, Splunk).
 
+    Callers only enqueue records; a background QueueListener thread does the actual
+    (buffered) file and console writes, so disk latency stays off request paths.
+
     Attributes:
         logs_dir (str): Directory where log files will be stored.
         log_file_path (str): Full path of the log file for this session.
 
+    Handlers and structlog are configured once per process (by the first `get_logger`
+    call); later calls only return a logger, so no extra file handles are opened.
     """
 
+    _configured = False
+    _configure_lock = threading.Lock()
+
     def __init__(self, log_dir="logs"):
         """
         Initialize the logger directory and create a timestamped log file.
@@ -44,9 +111,20 @@ class CustomLogger:
             structlog.BoundLogger: A JSON-structured logger instance.
         """
         logger_name = os.path.basename(name)
+        self._configure()
+        return structlog.get_logger(logger_name)
 
-        # File handler → logs saved to disk
-        file_handler = logging.FileHandler(self.log_file_path)
+    def _configure(self):
+        """Attach file/console handlers and configure structlog, once per process."""
+        with CustomLogger._configure_lock:
+            if not CustomLogger._configured:
+                self._setup()
+                CustomLogger._configured = True
+
+    def _setup(self):
+        """Attach file/console handlers and configure structlog."""
+        # File handler → logs saved to disk (buffered)
+        file_handler = _BufferedFileHandler(self.log_file_path)
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(logging.Formatter("%(message)s"))  # raw JSON (structlog formats it)
 
@@ -55,11 +133,21 @@ class CustomLogger:
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(logging.Formatter("%(message)s"))
 
+        # Caller threads only enqueue; the listener thread writes to file + console
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(logging.INFO)
+        listener = _FlushingQueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)  # drains the queue before logging.shutdown() closes handlers
+
         # Configure Python's logging module
         logging.basicConfig(
             level=logging.INFO,
             format="%(message)s",  # structlog will format actual JSON
-            handlers=[file_handler, console_handler]
+            handlers=[queue_handler]
         )
 
         # Configure structlog for structured JSON logging
@@ -68,12 +156,13 @@ class CustomLogger:
                 structlog.processors.TimeStamper(fmt='iso', utc=True, key="timestamp"),  # ISO UTC timestamp
                 structlog.processors.add_log_level,  # Adds log level
                 structlog.processors.EventRenamer(to="event"),  # Standardizes "msg" → "event"
-                structlog.processors.JSONRenderer()  # Converts dict → JSON string
+                structlog.processors.JSONRenderer(serializer=_orjson_dumps)  # Converts dict → JSON string (orjson)
             ],
+            # Calls below INFO return immediately, before any processor runs
+            wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
             logger_factory=structlog.stdlib.LoggerFactory(),
             cache_logger_on_first_use=True,
         )
-        return structlog.get_logger(logger_name)
 
 
 # --- Usage Example ---
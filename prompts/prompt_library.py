@@ -14,21 +14,19 @@ document_analysis = ChatPromptTemplate.from_template(
 )
 
 
-document_comparison= ChatPromptTemplate.from_template(
-    """
-    You will be provided with content from two PDFs. Your tasks are as follows:
-    1. Compare the content in two PDFs
-    2. Identify the difference in PDF and not down the page number
-    3. The output you provide must be page wise comparison content.
-    4. If any page do not have any change, mention as "NO Change Found".
-    
-    Input documents: 
-    {combined_docs}
-    
-    output format:
-    {format_instructions}
-    """
-)
+# Static task + output format first, documents last: the instructions (with format_instructions
+# pre-bound via .partial) form an identical prefix on every call, which prompt-prefix caching can reuse.
+document_comparison= ChatPromptTemplate.from_messages([
+    ("system", (
+        "You will be provided with content from two PDFs. Your tasks are as follows:\n"
+        "1. Compare the content in two PDFs\n"
+        "2. Identify the difference in PDF and not down the page number\n"
+        "3. The output you provide must be page wise comparison content.\n"
+        "4. If any page do not have any change, mention as \"NO Change Found\".\n\n"
+        "output format:\n{format_instructions}"
+    )),
+    ("human", "Input documents:\n{combined_docs}"),
+])
 
 contextualize_question_prompt  = ChatPromptTemplate.from_messages([
     ("system", (
@@ -41,6 +39,8 @@ contextualize_question_prompt  = ChatPromptTemplate.from_messages([
 
 ])
 
+# Keep static instructions first, then retrieved context, then chat history / input:
+# providers with prompt-prefix caching can only reuse the leading, unchanged part of the prompt.
 context_qa_prompt = ChatPromptTemplate.from_messages([
     ("system", (
 "You are an assistant designed to answer questions using the provided context. Rely only on the retrieved "
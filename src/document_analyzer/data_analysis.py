@@ -1,10 +1,10 @@
 import os
 import sys
-from utils.model_loader import ModelLoader
-from logger.custom_logger import CustomLogger
+from utils.model_loader import get_loader
+from utils.output_parsers import FastJsonOutputParser
+from logger import get_logger
 from exception.custom_exception import DocumentPortalException
 from model.models import *
-from langchain_core.output_parsers import JsonOutputParser
 from langchain.output_parsers import OutputFixingParser
 from prompts.prompt_library import PROMPT_REGISTRY
 
@@ -25,13 +25,15 @@ class DocumentAnalyzer:
         Raises:
             DocumentPortalException: If initialization fails.
         """
-        self.log = CustomLogger().get_logger(__name__)
+        self.log = get_logger(__name__)
         try:
-            self.loader = ModelLoader()
+            self.loader = get_loader()
             self.llm = self.loader.load_llm(model_name="google")
 
             # Output parsers - ensures the LLM output comes back as structured JSON that matches your Metadata Pydantic model.
-            self.parser = JsonOutputParser(pydantic_object=Metadata)
+            self.parser = FastJsonOutputParser(pydantic_object=Metadata)
+            # Schema is static, so render the format instructions once instead of per call
+            self._format_instructions = self.parser.get_format_instructions()
 
             # Output fixing parser - if the LLM output is invalid JSON, it re-asks the LLM to “fix” it into the correct format.
             self.fixing_parser = OutputFixingParser.from_llm(
@@ -39,7 +41,13 @@ class DocumentAnalyzer:
                 llm=self.llm
             )
 
-            self.prompt = PROMPT_REGISTRY["document_analysis"]
+            # Bind the constant format instructions once; each call only fills document_text
+            self.prompt = PROMPT_REGISTRY["document_analysis"].partial(
+                format_instructions=self._format_instructions
+            )
+
+            # chain pipeline - Order matters in chain (built once, reused per call)
+            self._chain = self.prompt | self.llm | self.fixing_parser
 
             self.log.info("DocumentAnalyzer initialized successfully")
 
@@ -62,14 +70,7 @@ class DocumentAnalyzer:
             DocumentPortalException: If analysis fails.
         """
         try:
-            # chain pipeline - Order matters in chain
-            chain = self.prompt | self.llm | self.fixing_parser
-            self.log.info("Meta-data analysis chain initialized")
-
-            response = chain.invoke({
-                "format_instructions": self.parser.get_format_instructions(),
-                "document_text": document_text
-            })
+            response = self._chain.invoke({"document_text": document_text})
 
             self.log.info("Metadata extraction successful", keys=list(response.keys()))
             return response
@@ -1,20 +1,124 @@
 import sys
 import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from operator import itemgetter
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 
+import faiss
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableLambda, RunnablePassthrough
 from langchain_community.vectorstores import FAISS
 
-from utils.model_loader import ModelLoader
-from logger.custom_logger import CustomLogger
-from exception.custom_exception_archive import DocumentPortalException
+from utils.model_loader import get_embeddings, get_llm
+from utils.faiss_store import index_files, load_vectorstore
+from logger import get_logger
+from exception.custom_exception import DocumentPortalException
 from prompts.prompt_library import PROMPT_REGISTRY
 from model.models import PromptType
+from src.document_chat.semantic_cache import SemanticCache, get_semantic_cache
+
+# Runs speculative retrievals alongside the question-rewrite LLM call
+_SPECULATION_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-speculate")
+MAX_BATCH_CONCURRENCY = 8  # queries in flight at once in ConversationalRAG.invoke_batch
+SEMANTIC_CACHE_THRESHOLD = 0.98  # cosine for a rewritten question to reuse an answer (0.95 let years / figures collide)
+SPECULATE_MIN_WORDS = 5  # shorter follow-ups ("why?", "and the second one") nearly always get rewritten
+# Words that usually point back into the chat history, so the rewrite will change the question
+FOLLOW_UP_WORDS = frozenset({
+    "it", "its", "this", "that", "these", "those", "they", "them", "their", "he", "she", "him", "her",
+    "his", "hers", "one", "ones", "former", "latter", "above", "previous", "same", "else", "also", "more",
+})
+
+
+@lru_cache(maxsize=1)
+def _shared_question_rewriter():
+    """Question-rewrite sub-chain; identical for every session, so built once per process."""
+    return (
+            {'input': itemgetter("input"), "chat_history": itemgetter("chat_history")}
+            | PROMPT_REGISTRY[PromptType.CONTEXTUALIZE_QUESTION.value]
+            | get_llm()
+            | StrOutputParser()
+    )
+
+
+@lru_cache(maxsize=1)
+def _shared_answer_generator():
+    """QA prompt -> LLM -> string tail shared by every session's answer chains."""
+    return PROMPT_REGISTRY[PromptType.CONTEXT_QA.value] | get_llm() | StrOutputParser()
+
+
+def _likely_standalone(question: str) -> bool:
+    """
+    True if `question` probably survives the rewrite unchanged: long enough and free of
+    words that refer back to the chat history. Only then is speculative retrieval worth it.
+    """
+    words = [w.strip(".,;:!?\"'()").casefold() for w in question.split()]
+    return len(words) >= SPECULATE_MIN_WORDS and FOLLOW_UP_WORDS.isdisjoint(words)
+
+
+def _same_question(a: str, b: str) -> bool:
+    """True if two questions differ only in whitespace / case."""
+    return " ".join(a.split()).casefold() == " ".join(b.split()).casefold()
+
+
+@lru_cache(maxsize=1)
+def _gpu_resources():
+    """Process-wide GPU scratch memory; must outlive every index placed on the GPU."""
+    return faiss.StandardGpuResources()
+
+
+def _maybe_to_gpu(index):
+    """
+    Move a FAISS index onto GPU 0 when a faiss-gpu build and a device are available.
+
+    Falls back to the CPU index on faiss-cpu builds, machines without a GPU, and
+    index types the GPU backend does not support.
+    """
+    if not hasattr(faiss, "index_cpu_to_gpu") or faiss.get_num_gpus() == 0:
+        return index
+    try:
+        return faiss.index_cpu_to_gpu(_gpu_resources(), 0, index)
+    except Exception as e:
+        get_logger(__name__).warning("FAISS GPU transfer failed, searching on CPU", error=str(e))
+        return index
 
 
+@lru_cache(maxsize=4)
+def _load_vectorstore(index_path: str, index_name: str, mtime: float) -> FAISS:
+    """
+    Open a saved FAISS index; `mtime` is part of the cache key so rebuilt indexes are reloaded.
+
+    The index file is memory-mapped read-only instead of being copied into RAM
+    (or copied to the GPU when one is available), so the returned store is for
+    searching only (use FaissManager to add documents).
+    """
+    vs = load_vectorstore(index_path, get_embeddings(), index_name=index_name, mmap=True)
+    vs.index = _maybe_to_gpu(vs.index)  # vectors are copied to device memory; embeddings stay on CPU
+    return vs
+
+
+def get_vectorstore(index_path: str, index_name: str = "index") -> FAISS:
+    """
+    Return a cached FAISS vectorstore for `index_path`, reloading only when the index files change.
+
+    Args:
+        index_path (str): Path to the FAISS index directory.
+        index_name (str, optional): Name of the FAISS index. Defaults to "index".
+
+    Returns:
+        FAISS: Loaded vectorstore (shared across callers).
+    """
+    return _load_vectorstore(os.path.abspath(index_path), index_name, _index_mtime(index_path, index_name))
+
+
+def _index_mtime(index_path: str, index_name: str) -> float:
+    """Latest modification time of the index files: the version used by the caches here."""
+    return max(p.stat().st_mtime for p in index_files(index_path, index_name))
+
 
 class ConversationalRAG:
     """
@@ -29,20 +133,24 @@ class ConversationalRAG:
         - Load a FAISS retriever for document search.
         - Build a LangChain Expression Language (LCEL) graph for
           contextual question answering.
-        - Provide a public `invoke` method for user queries with
-          chat history context.
+        - Provide public `invoke` / `ainvoke` / `astream` methods for user
+          queries with chat history context.
 
     Attributes:
         session_id (Optional[str]): Unique identifier for the session (used for logging).
         retriever: FAISS retriever object for document retrieval.
         chain: LCEL pipeline that ties together contextualization, retrieval, and answer generation.
+        question_rewriter: LCEL pipeline that rewrites the user question into a standalone one.
+        answer_chain: Retrieval + answer pipeline that starts from an already rewritten question.
+        semantic_cache (Optional[SemanticCache]): Answer cache keyed by the rewritten question.
         llm: Loaded Large Language Model instance.
         contextualize_prompt (ChatPromptTemplate): Prompt for rewriting user questions.
         qa_prompt (ChatPromptTemplate): Prompt for final question answering.
         log: Custom logger instance.
     """
 
-    def __init__(self, session_id: Optional[str], retriever=None):
+    def __init__(self, session_id: Optional[str], retriever=None,
+                 semantic_cache: Optional[SemanticCache] = None):
         """
         Initialize a ConversationalRAG instance.
 
@@ -50,12 +158,14 @@ class ConversationalRAG:
             session_id (Optional[str]): Unique session identifier.
             retriever: Optional retriever instance. If provided, LCEL chain
                 will be built immediately.
+            semantic_cache (Optional[SemanticCache]): Optional answer cache
+                (`load_retriever_from_faiss(..., semantic_cache=True)` attaches a per-index one).
 
         Raises:
             DocumentPortalException: If initialization fails.
         """
         try:
-            self.log = CustomLogger().get_logger(__name__)
+            self.log = get_logger(__name__)
             self.session_id = session_id
 
             # Load LLM and prompts at once
@@ -69,7 +179,10 @@ class ConversationalRAG:
 
             # Lazy pieces
             self.retriever = retriever
+            self.semantic_cache = semantic_cache
             self.chain = None
+            self.question_rewriter = None
+            self.answer_chain = None
 
             if self.retriever is not None:
                 self._build_lcel_chain()
@@ -90,6 +203,7 @@ class ConversationalRAG:
             index_name: str = "index",
             search_type: str = "similarity",
             search_kwargs: Optional[Dict[str, Any]] = None,
+            semantic_cache: bool = False,
     ):
         """
         Load FAISS retriever from local index files.
@@ -100,6 +214,9 @@ class ConversationalRAG:
             index_name (str, optional): Name of the FAISS index. Defaults to "index".
             search_type (str, optional): Retrieval strategy ("similarity", "mmr", etc.).
             search_kwargs (Optional[Dict[str, Any]]): Extra parameters for the retriever.
+            semantic_cache (bool): Reuse answers for near-identical rewritten questions
+                (cosine >= SEMANTIC_CACHE_THRESHOLD) on this index version. Off by default:
+                every query then pays an extra embedding call and skips speculative retrieval.
 
         Returns:
             retriever: Loaded FAISS retriever instance.
@@ -112,23 +229,34 @@ class ConversationalRAG:
             if not os.path.isdir(index_path):
                 raise FileNotFoundError(f"FAISS index directory not found: {index_path}")
 
-            embeddings = ModelLoader().load_embeddings()
-            vectorstore = FAISS.load_local(
-                index_path,
-                embeddings,
-                index_name=index_name,
-                allow_dangerous_deserialization=True,
-            )
-
-            if search_kwargs is None:
-                search_kwargs = {"k": k}
-
-            self.retriever = vectorstore.as_retriever(
-                search_type=search_type,
-                search_kwargs=search_kwargs,
-            )
+            vectorstore = get_vectorstore(index_path, index_name=index_name)
+
+            search_kwargs = dict(search_kwargs or {"k": k})  # copy: defaults below must not leak to the caller
+            if search_type == "mmr":
+                search_kwargs.setdefault("fetch_k", 20)
+
+            current = self.retriever
+            if not (
+                    current is not None
+                    and getattr(current, "vectorstore", None) is vectorstore
+                    and current.search_type == search_type
+                    and current.search_kwargs == search_kwargs
+            ):
+                self.retriever = vectorstore.as_retriever(
+                    search_type=search_type,
+                    search_kwargs=search_kwargs,
+                )
+            if semantic_cache:
+                # Answers are only reusable within the same index version and retrieval settings
+                cache_key = (f"{os.path.abspath(index_path)}::{index_name}::{_index_mtime(index_path, index_name)}"
+                             f"::{search_type}::{sorted(search_kwargs.items())}")
+                self.semantic_cache = get_semantic_cache(
+                    cache_key, get_embeddings(), threshold=SEMANTIC_CACHE_THRESHOLD
+                )
 
-            self._build_lcel_chain()
+            # The graph reads self.retriever at call time, so it only needs building once
+            if self.chain is None:
+                self._build_lcel_chain()
 
             self.log.info(
                 "FAISS retriever loaded successfully",
@@ -166,23 +294,170 @@ class ConversationalRAG:
                 )
             chat_history = chat_history or []
             payload = {"input": user_input, "chat_history": chat_history}
-            answer = self.chain.invoke(payload)
 
-            if not answer:
-                self.log.warning(
-                    "No answer generated", user_input=user_input, session_id=self.session_id
+            if self.semantic_cache is None:
+                answer = self.chain.invoke(payload)
+            else:
+                # Rewrite first so paraphrased questions hit the same cache entry
+                rewritten = self._rewrite(payload)
+                q = self.semantic_cache.embed(rewritten)
+                answer = self.semantic_cache.get(q)
+                if answer is not None:
+                    self.log.info("Semantic cache hit", session_id=self.session_id, rewritten=rewritten)
+                    return answer
+                answer = self.answer_chain.invoke({**payload, "rewritten_input": rewritten})
+                if answer:
+                    self.semantic_cache.put(q, answer)
+
+            return self._finish(answer, user_input)
+        except Exception as e:
+            self.log.error(f"Failed to invoke ConversationalRAG: {e}", error=str(e))
+            raise DocumentPortalException("Failed to invoke ConversationalRAG", sys)
+
+    async def ainvoke(self, user_input: str, chat_history: Optional[List[BaseMessage]] = None):
+        """
+        Async variant of `invoke`: awaits the retriever and LLM calls instead of blocking a thread.
+
+        Args:
+            user_input (str): User's question or input text.
+            chat_history (Optional[List[BaseMessage]]): Previous chat messages
+                for context (default is empty list).
+
+        Returns:
+            str: Generated answer from the LLM.
+
+        Raises:
+            DocumentPortalException: If RAG chain is not initialized or invocation fails.
+        """
+        try:
+            if self.chain is None:
+                raise DocumentPortalException(
+                    "RAG chain not initialized yet, Call load_retriever_from_fails instead",
+                    sys
                 )
-                return "No answer by the model"
+            chat_history = chat_history or []
+            payload = {"input": user_input, "chat_history": chat_history}
+
+            if self.semantic_cache is None:
+                answer = await self.chain.ainvoke(payload)
+            else:
+                rewritten = await self._arewrite(payload)
+                q = await self.semantic_cache.aembed(rewritten)
+                answer = self.semantic_cache.get(q)
+                if answer is not None:
+                    self.log.info("Semantic cache hit", session_id=self.session_id, rewritten=rewritten)
+                    return answer
+                answer = await self.answer_chain.ainvoke({**payload, "rewritten_input": rewritten})
+                if answer:
+                    self.semantic_cache.put(q, answer)
+
+            return self._finish(answer, user_input)
+        except Exception as e:
+            self.log.error(f"Failed to invoke ConversationalRAG: {e}", error=str(e))
+            raise DocumentPortalException("Failed to invoke ConversationalRAG", sys)
+
+    async def astream(
+            self, user_input: str, chat_history: Optional[List[BaseMessage]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the answer for a user query as the LLM generates it.
+
+        Same pipeline (and semantic cache) as `ainvoke`, but text chunks are yielded
+        as they arrive, so the first token reaches the caller before generation ends.
+        A semantic-cache hit is yielded as a single chunk.
+
+        Args:
+            user_input (str): User's question or input text.
+            chat_history (Optional[List[BaseMessage]]): Previous chat messages
+                for context (default is empty list).
+
+        Yields:
+            str: Chunks of the generated answer.
+
+        Raises:
+            DocumentPortalException: If RAG chain is not initialized or streaming fails.
+        """
+        try:
+            if self.chain is None:
+                raise DocumentPortalException(
+                    "RAG chain not initialized yet, Call load_retriever_from_fails instead",
+                    sys
+                )
+            chat_history = chat_history or []
+            payload = {"input": user_input, "chat_history": chat_history}
+
+            q = None
+            if self.semantic_cache is None:
+                stream = self.chain.astream(payload)
+            else:
+                rewritten = await self._arewrite(payload)
+                q = await self.semantic_cache.aembed(rewritten)
+                cached = self.semantic_cache.get(q)
+                if cached is not None:
+                    self.log.info("Semantic cache hit", session_id=self.session_id, rewritten=rewritten)
+                    yield cached
+                    return
+                stream = self.answer_chain.astream({**payload, "rewritten_input": rewritten})
+
+            parts: List[str] = []
+            async for chunk in stream:
+                parts.append(chunk)
+                yield chunk
+
+            answer = "".join(parts)
+            if answer and q is not None:
+                self.semantic_cache.put(q, answer)
+            final = self._finish(answer, user_input)
+            if not answer:
+                yield final
+        except Exception as e:
+            self.log.error(f"Failed to stream ConversationalRAG: {e}", error=str(e))
+            raise DocumentPortalException("Failed to stream ConversationalRAG", sys)
+
+    def _finish(self, answer: Optional[str], user_input: str) -> str:
+        """Log the outcome of one query and substitute a placeholder for an empty answer."""
+        if not answer:
+            self.log.warning(
+                "No answer generated", user_input=user_input, session_id=self.session_id
+            )
+            return "No answer by the model"
+        if self.log.is_enabled_for(logging.INFO):  # skip building the preview when INFO is filtered out
             self.log.info(
                 "Chain invoked successfully, answer on the way",
                 session_id=self.session_id,
                 user_input=user_input,
                 answer_preview=answer[:210],
             )
-            return answer
-        except Exception as e:
-            self.log.error(f"Failed to invoke ConversationalRAG: {e}", error=str(e))
-            raise DocumentPortalException("Failed to invoke ConversationalRAG", sys)
+        return answer
+
+    def invoke_batch(
+            self,
+            inputs: List[Tuple[str, Optional[List[BaseMessage]]]],
+            max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ) -> List[str]:
+        """
+        Answer several queries concurrently, overlapping their retriever and LLM round-trips.
+
+        Args:
+            inputs (List[Tuple[str, Optional[List[BaseMessage]]]]): (user_input, chat_history) pairs.
+            max_concurrency (int): Maximum number of queries in flight at once.
+
+        Returns:
+            List[str]: Answers, in input order.
+
+        Raises:
+            DocumentPortalException: If the RAG chain is not initialized or any query fails.
+        """
+        if self.chain is None:
+            raise DocumentPortalException(
+                "RAG chain not initialized yet, Call load_retriever_from_fails instead",
+                sys
+            )
+        # Each query goes through invoke(), so the semantic cache and empty-answer handling still apply
+        runner = RunnableLambda(lambda item: self.invoke(item[0], item[1]))
+        answers = runner.batch(list(inputs), config={"max_concurrency": max_concurrency})
+        self.log.info("Batch invoked", session_id=self.session_id, queries=len(answers))
+        return answers
 
     def _load_llm(self):
         """
@@ -195,7 +470,7 @@ class ConversationalRAG:
             DocumentPortalException: If loading fails.
         """
         try:
-            llm = ModelLoader().load_llm()
+            llm = get_llm()
             if not llm:
                 raise ValueError("LLM could not be loaded")
             self.log.info("LLM loaded Successfully", session_id=self.session_id)
@@ -217,6 +492,71 @@ class ConversationalRAG:
         """
         return "\n\n".join(getattr(d, "page_content", str(d)) for d in docs)
 
+    def _retrieve_context(self, question: str, config: RunnableConfig) -> str:
+        """
+        Retrieve documents for an (already rewritten) question and format them.
+        Fused into one step so each turn pays for a single Runnable layer.
+        """
+        return self._format_docs(self.retriever.invoke(question, config=config))
+
+    async def _aretrieve_context(self, question: str, config: RunnableConfig) -> str:
+        """Async variant of `_retrieve_context`."""
+        return self._format_docs(await self.retriever.ainvoke(question, config=config))
+
+    def _rewrite(self, inputs: Dict[str, Any], config: Optional[RunnableConfig] = None) -> str:
+        """Return a standalone question; without chat history there is nothing to rewrite."""
+        if not inputs.get("chat_history"):
+            return inputs["input"]
+        return self.question_rewriter.invoke(inputs, config=config)
+
+    def _rewrite_and_retrieve(self, inputs: Dict[str, Any], config: RunnableConfig) -> str:
+        """
+        Rewrite the user question with chat history, then retrieve and format context.
+
+        - No chat history: retrieve on the raw input (skips one LLM call).
+        - Follow-ups that look standalone (`_likely_standalone`): retrieve on the raw input
+          speculatively while the rewrite runs, and keep that result if the rewrite left the
+          question unchanged. A started retrieval cannot be cancelled, so when the rewrite
+          does change such a question the turn pays one extra query embedding + FAISS search.
+        - Other follow-ups: rewrite first, then retrieve once.
+        """
+        question = inputs["input"]
+        if not inputs.get("chat_history"):
+            return self._retrieve_context(question, config)
+        if not _likely_standalone(question):
+            return self._retrieve_context(self.question_rewriter.invoke(inputs, config=config), config)
+
+        speculative = _SPECULATION_POOL.submit(self._retrieve_context, question, config)
+        rewritten = self.question_rewriter.invoke(inputs, config=config)
+        if _same_question(rewritten, question):
+            return speculative.result()
+        self.log.info("Speculative retrieval discarded", session_id=self.session_id)
+        return self._retrieve_context(rewritten, config)
+
+    async def _arewrite(self, inputs: Dict[str, Any], config: Optional[RunnableConfig] = None) -> str:
+        """Async variant of `_rewrite`."""
+        if not inputs.get("chat_history"):
+            return inputs["input"]
+        return await self.question_rewriter.ainvoke(inputs, config=config)
+
+    async def _arewrite_and_retrieve(self, inputs: Dict[str, Any], config: RunnableConfig) -> str:
+        """Async variant of `_rewrite_and_retrieve`; the speculative retrieval runs as a task."""
+        question = inputs["input"]
+        if not inputs.get("chat_history"):
+            return await self._aretrieve_context(question, config)
+        if not _likely_standalone(question):
+            rewritten = await self.question_rewriter.ainvoke(inputs, config=config)
+            return await self._aretrieve_context(rewritten, config)
+
+        speculative = asyncio.ensure_future(self._aretrieve_context(question, config))
+        rewritten = await self.question_rewriter.ainvoke(inputs, config=config)
+        if _same_question(rewritten, question):
+            return await speculative
+        # Only drops the result: the embedding / search already in an executor thread still runs
+        speculative.cancel()
+        self.log.info("Speculative retrieval discarded", session_id=self.session_id)
+        return await self._aretrieve_context(rewritten, config)
+
     def _build_lcel_chain(self):
         """
         Build the LangChain Expression Language (LCEL) graph.
@@ -233,27 +573,24 @@ class ConversationalRAG:
             if self.retriever is None:
                 raise DocumentPortalException("No retriever set before building chain", sys)
 
-            # 1) Rewrite user question with chat history context
-            question_rewriter = (
-                    {'input': itemgetter("input"), "chat_history": itemgetter("chat_history")}
-                    | self.contextualize_prompt
-                    | self.llm
-                    | StrOutputParser()
-            )
+            # 1) Rewrite user question with chat history context (shared across sessions)
+            self.question_rewriter = _shared_question_rewriter()
+            answer_generator = _shared_answer_generator()
 
-            # 2) Retrieve docs for rewritten question
-            retrieve_docs = question_rewriter | self.retriever | self._format_docs
+            # 2) Retrieve docs for rewritten question (rewrite + retrieve + format in one step)
+            retrieve_docs = RunnableLambda(self._rewrite_and_retrieve, afunc=self._arewrite_and_retrieve)
 
             # 3) Answer using retrieved context + original input + chat history
-            self.chain = (
-                    {
-                        "context": retrieve_docs,
-                        "input": itemgetter("input"),
-                        "chat_history": itemgetter("chat_history"),
-                    }
-                    | self.qa_prompt
-                    | self.llm
-                    | StrOutputParser()
+            #    (assign adds "context" and passes input / chat_history through unchanged)
+            self.chain = RunnablePassthrough.assign(context=retrieve_docs) | answer_generator
+
+            # Same answer step, fed by a question that was already rewritten (semantic-cache path)
+            self.answer_chain = (
+                    RunnablePassthrough.assign(
+                        context=itemgetter("rewritten_input")
+                                | RunnableLambda(self._retrieve_context, afunc=self._aretrieve_context)
+                    )
+                    | answer_generator
             )
 
             self.log.info("LCEL graph built successfully", session_id=self.session_id)
@@ -0,0 +1,106 @@
+"""
+Module: semantic_cache.py
+
+Semantic answer cache for ConversationalRAG.
+
+Answers are keyed by the embedding of the rewritten (standalone) question, so
+paraphrases such as "How do I deploy?" / "Deployment steps?" can share one
+retrieval + LLM round-trip.
+"""
+
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+import faiss
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from logger import GLOBAL_LOGGER as log
+
+MAX_SEMANTIC_CACHES = 32  # per-index caches kept; keys change when an index is rebuilt
+
+
+class SemanticCache:
+    """
+    Small in-memory cache of (question embedding -> answer).
+
+    Uses an inner-product FAISS index over L2-normalized vectors, i.e. cosine
+    similarity. The index is reset once `max_entries` is reached to keep it bounded.
+    """
+
+    def __init__(self, embeddings: Embeddings, threshold: float = 0.98, max_entries: int = 1024):
+        """
+        Args:
+            embeddings (Embeddings): Model used to embed questions.
+            threshold (float): Minimum cosine similarity for a hit.
+            max_entries (int): Entries kept before the cache is reset.
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._index: Optional[faiss.IndexFlatIP] = None
+        self._answers: List[str] = []
+        self._lock = threading.Lock()
+
+    def embed(self, question: str) -> np.ndarray:
+        """Return the normalized (1, d) float32 embedding for `question`."""
+        q = np.asarray([self.embeddings.embed_query(question)], dtype="float32")
+        faiss.normalize_L2(q)
+        return q
+
+    async def aembed(self, question: str) -> np.ndarray:
+        """Async variant of `embed`."""
+        q = np.asarray([await self.embeddings.aembed_query(question)], dtype="float32")
+        faiss.normalize_L2(q)
+        return q
+
+    def get(self, q: np.ndarray) -> Optional[str]:
+        """Return a cached answer for embedding `q`, or None on a miss."""
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+            scores, ids = self._index.search(q, 1)
+            if scores[0, 0] >= self.threshold:
+                return self._answers[ids[0, 0]]
+            return None
+
+    def put(self, q: np.ndarray, answer: str) -> None:
+        """Store `answer` under embedding `q`."""
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(q.shape[1])
+            if self._index.ntotal >= self.max_entries:  # FIFO-style reset keeps memory bounded
+                self._index.reset()
+                self._answers.clear()
+                log.info("Semantic cache reset", max_entries=self.max_entries)
+            self._index.add(q)
+            self._answers.append(answer)
+
+
+_CACHES: "OrderedDict[str, SemanticCache]" = OrderedDict()  # least recently used first
+_CACHES_LOCK = threading.Lock()
+
+
+def get_semantic_cache(key: str, embeddings: Embeddings, **options: Any) -> SemanticCache:
+    """
+    Return the process-wide cache for `key` (index path + version), creating it on first use.
+    The least recently used cache is dropped beyond `MAX_SEMANTIC_CACHES`, so keys of
+    rebuilt indexes do not pile up.
+
+    Args:
+        key (str): Cache namespace; answers are only shared within one index version.
+        embeddings (Embeddings): Embedding model for a newly created cache.
+        **options: `threshold` / `max_entries` for a newly created cache.
+
+    Returns:
+        SemanticCache: Shared cache instance.
+    """
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = SemanticCache(embeddings, **options)
+            if len(_CACHES) > MAX_SEMANTIC_CACHES:
+                _CACHES.popitem(last=False)
+        else:
+            _CACHES.move_to_end(key)
+        return cache
@@ -0,0 +1,59 @@
+"""Tests for utils/embedding_cache.py: storage precisions and mixed-precision cache directories."""
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from utils.embedding_cache import CachedEmbeddings
+
+DIM = 3072  # gemini-embedding-001 output size
+MAX_COSINE_ERROR = {"fp32": 1e-12, "fp16": 1e-6, "sq8": 1e-4}  # worst 1 - cosine per stored vector
+
+
+def _cache(tmp_path, precision):
+    return CachedEmbeddings(DeterministicFakeEmbedding(size=DIM), tmp_path, precision=precision, model_name="test")
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+
+def _cosine_error(a, b):
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    return 1.0 - float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+@pytest.mark.parametrize("precision", ["fp32", "fp16", "sq8"])
+def test_store_load_round_trip_within_tolerance(tmp_path, precision):
+    cache = _cache(tmp_path, precision)
+    for i, vector in enumerate(_vectors(20)):
+        key = f"{precision}-{i}"
+        returned = cache._store(key, vector.tolist())
+        loaded = cache._load(key)
+        assert loaded == returned  # cold and warm cache hand FAISS the same vector
+        assert len(loaded) == DIM
+        if precision == "fp32":
+            assert loaded == vector.tolist()  # lossless
+        assert _cosine_error(vector, loaded) <= MAX_COSINE_ERROR[precision]
+
+
+def test_mixed_precision_directory_reads_back(tmp_path):
+    vectors = _vectors(3, seed=1)
+    written = {}
+    for precision, vector in zip(["fp32", "fp16", "sq8"], vectors):
+        written[precision] = _cache(tmp_path, precision)._store(precision, vector.tolist())
+
+    for reader_precision in ["fp32", "fp16", "sq8"]:
+        reader = _cache(tmp_path, reader_precision)  # the reader's own setting only affects new entries
+        for (precision, stored), vector in zip(written.items(), vectors):
+            loaded = reader._load(precision)
+            assert loaded == stored
+            assert _cosine_error(vector, loaded) <= MAX_COSINE_ERROR[precision]
+
+
+def test_embed_documents_serves_cached_entries(tmp_path):
+    texts = ["alpha", "beta", "alpha"]
+    cold = _cache(tmp_path, "sq8").embed_documents(texts)
+    warm = _cache(tmp_path, "fp32").embed_documents(texts)
+    assert warm == cold
+    assert cold[0] == cold[2]
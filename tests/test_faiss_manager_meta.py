@@ -0,0 +1,71 @@
+"""Tests for FaissManager's fingerprint metadata: append log, torn-line replay and compaction."""
+
+import orjson
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+import src.document_ingestion.data_pipeline as data_pipeline
+from src.document_ingestion.data_pipeline import FaissManager
+
+
+class _Loader:
+    """Minimal ModelLoader stand-in: config + a deterministic local embedding model."""
+
+    config = {"embedding_model": {}}
+
+    def load_embeddings(self):
+        return DeterministicFakeEmbedding(size=8)
+
+
+def _docs(source, n):
+    return [Document(page_content=f"{source} chunk {i}", metadata={"source": source, "row_id": i})
+            for i in range(n)]
+
+
+def _manager(index_dir):
+    return FaissManager(index_dir, _Loader(), emb_cache_dir=index_dir / ".emb_cache", save_every=1)
+
+
+def _log_keys(fm):
+    return [orjson.loads(line)["k"] for line in fm.meta_log_path.read_bytes().splitlines()]
+
+
+def test_append_torn_line_replay_and_compaction(tmp_path):
+    fm = _manager(tmp_path)
+    fm.load_or_create(["seed"], [{"source": "seed.pdf", "row_id": 0}])
+    assert fm.add_documents(_docs("a.pdf", 3)) == 3
+    assert _log_keys(fm) == ["a.pdf::0", "a.pdf::1", "a.pdf::2"]  # appended, JSON left as is
+
+    with open(fm.meta_log_path, "ab") as f:
+        f.write(b'{"k": "b.pdf::')  # interrupted append
+
+    fm = _manager(tmp_path)
+    assert fm._meta_stale  # torn line forces a compaction on the next write
+    fm.load_or_create()
+    assert fm.add_documents(_docs("a.pdf", 3)) == 0  # replayed keys still skip duplicates
+    assert fm.add_documents(_docs("b.pdf", 2)) == 2
+
+    assert not fm.meta_log_path.exists()  # folded into ingested_meta.json
+    rows = orjson.loads(fm.meta_path.read_bytes())["rows"]
+    assert set(rows) == {"seed.pdf::0", "a.pdf::0", "a.pdf::1", "a.pdf::2", "b.pdf::0", "b.pdf::1"}
+
+    fm = _manager(tmp_path)
+    fm.load_or_create()
+    assert fm.add_documents(_docs("a.pdf", 3) + _docs("b.pdf", 2)) == 0
+    assert fm.vs.index.ntotal == 6
+
+
+def test_log_is_compacted_past_line_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_pipeline, "META_LOG_COMPACT_LINES", 4)
+    fm = _manager(tmp_path)
+    fm.load_or_create(["seed"], [{"source": "seed.pdf", "row_id": 0}])
+
+    assert fm.add_documents(_docs("a.pdf", 3)) == 3
+    assert len(_log_keys(fm)) == 3
+    assert fm.add_documents(_docs("b.pdf", 2)) == 2  # 3 + 2 lines > 4: rewrite the JSON instead
+    assert not fm.meta_log_path.exists()
+
+    fm = _manager(tmp_path)
+    assert len(fm._meta["rows"]) == 6
+    fm.load_or_create()
+    assert fm.add_documents(_docs("b.pdf", 2)) == 0
@@ -0,0 +1,72 @@
+"""Tests for utils/faiss_store.py: generation layout, legacy fallback and consistency check."""
+
+import orjson
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+
+from utils.faiss_store import index_exists, index_files, load_vectorstore, save_vectorstore
+
+EMBEDDINGS = DeterministicFakeEmbedding(size=8)
+
+
+def _store(texts):
+    return FAISS.from_texts(texts, EMBEDDINGS, metadatas=[{"source": "a.pdf", "row_id": i} for i in range(len(texts))])
+
+
+def _generations(folder):
+    return sorted(p.name for p in folder.glob("index.*.faiss"))
+
+
+def test_save_then_load_round_trip(tmp_path):
+    vs = _store(["alpha", "beta", "gamma"])
+    save_vectorstore(vs, tmp_path)
+
+    assert (tmp_path / "index.current").exists()
+    assert index_exists(tmp_path)
+    loaded = load_vectorstore(tmp_path, EMBEDDINGS)
+    assert loaded.index.ntotal == 3
+    assert loaded.index_to_docstore_id == vs.index_to_docstore_id
+    docs = loaded.similarity_search("beta", k=1)
+    assert docs[0].page_content == "beta"
+    assert docs[0].metadata == {"source": "a.pdf", "row_id": 1}
+
+
+def test_legacy_save_local_layout_loads(tmp_path):
+    _store(["alpha", "beta"]).save_local(str(tmp_path))  # index.faiss + index.pkl, no pointer
+
+    index_path, docstore_path = index_files(tmp_path)
+    assert (index_path.name, docstore_path.name) == ("index.faiss", "index.pkl")
+    loaded = load_vectorstore(tmp_path, EMBEDDINGS)
+    assert loaded.index.ntotal == 2
+    assert loaded.similarity_search("alpha", k=1)[0].page_content == "alpha"
+
+
+def test_later_saves_remove_stale_generations_and_legacy_files(tmp_path):
+    _store(["legacy"]).save_local(str(tmp_path))
+
+    save_vectorstore(_store(["one"]), tmp_path)
+    first = _generations(tmp_path)
+    assert (tmp_path / "index.pkl").exists()  # previous (legacy) index is kept for in-flight readers
+
+    save_vectorstore(_store(["one", "two"]), tmp_path)
+    assert not (tmp_path / "index.faiss").exists()
+    assert not (tmp_path / "index.pkl").exists()
+    second = _generations(tmp_path)
+    assert len(second) == 2 and set(first) < set(second)
+
+    save_vectorstore(_store(["one", "two", "three"]), tmp_path)
+    third = _generations(tmp_path)
+    assert len(third) == 2 and first[0] not in third  # only current + previous survive
+    assert not list(tmp_path.glob("*.tmp"))
+    assert load_vectorstore(tmp_path, EMBEDDINGS).index.ntotal == 3
+
+
+def test_vector_and_document_count_mismatch_raises(tmp_path):
+    save_vectorstore(_store(["alpha", "beta", "gamma"]), tmp_path)
+    _, docstore_path = index_files(tmp_path)
+    rows = orjson.loads(docstore_path.read_bytes())
+    docstore_path.write_bytes(orjson.dumps(rows[:2]))
+
+    with pytest.raises(ValueError, match="out of sync"):
+        load_vectorstore(tmp_path, EMBEDDINGS)
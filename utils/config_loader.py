@@ -8,6 +8,7 @@
 
 # ----------- UPDATED CODE ------------------
 
+from functools import lru_cache
 from pathlib import Path
 import os
 import yaml
@@ -19,6 +20,7 @@ def load_config(config_path: str | None = None) -> dict:
     """
     Resolve config path reliably irrespective of CWD.
     Priority: explicit arg > CONFIG_PATH env > <project_root>/config/config.yaml
+    The YAML is parsed once per resolved path; treat the returned dict as read-only.
     :param config_path:
     :return:
     """
@@ -31,7 +33,12 @@ def load_config(config_path: str | None = None) -> dict:
     if not path.is_absolute():
         path = _project_root() / path
 
-    if not path.exists():
+    return _read_config(str(path))
+
+@lru_cache(maxsize=8)
+def _read_config(path: str) -> dict:
+    """Parse the YAML at `path` (once per process; a missing file is not cached)."""
+    if not os.path.exists(path):
         raise FileNotFoundError(f"Config file not found at {path}")
 
     with open(path, "r", encoding="utf-8") as f:
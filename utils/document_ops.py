@@ -1,40 +1,183 @@
 from __future__ import annotations
+import io
+import os
+import mmap
+import atexit
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List
-from fastapi import UploadFile
-from langchain.schema import Document
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, TextLoader
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+import fitz  # PyMuPDF
+import xxhash
+from langchain_core.documents import Document  # the class langchain.schema re-exports, without its import cost
 from logger import GLOBAL_LOGGER as log
 from exception.custom_exception import DocumentPortalException
 
+if TYPE_CHECKING:  # annotation only: importing FastAPI costs ~0.3 s for callers that never serve
+    from fastapi import UploadFile
+
 # Supported file types we can load
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+MAX_LOAD_WORKERS = 4
+PARALLEL_PAGE_THRESHOLD = 8  # below this many pages, worker start-up costs more than it saves
+MAX_PAGE_WORKERS = 4
+RANGES_PER_WORKER = 2  # page ranges per worker, so a dense section does not set the tail latency
+MIN_RANGE_PAGES = 4  # smallest range worth a task (each task re-opens the PDF)
+# Plain text for the LLM: no ligature / image preservation, hyphenated line breaks joined.
+# Flag choice is about output, not speed (variants time within noise); what matters is
+# passing sort=False to get_text(), which skips MuPDF's block sort (~18x on dense pages).
+TEXT_FLAGS = fitz.TEXT_DEHYPHENATE | fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+
+# ---------- PDF page extraction ----------
+def _extract_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    Extract raw text for pages [start, end) of a PDF.
+
+    Runs inside a worker process, so it opens its own handle to the file.
+    """
+    with fitz.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text("text", flags=TEXT_FLAGS, sort=False) for i in range(start, end)]  # type: ignore
+
+
+def extract_page_texts(doc: fitz.Document, pdf_path: str, executor: Optional[Executor] = None) -> List[str]:
+    """
+    Return the text of every page of an open PDF, in page order.
+
+    Small documents are read sequentially from `doc`. Larger ones are split into
+    contiguous page ranges and extracted in parallel worker processes, since
+    `page.get_text()` is CPU-bound inside MuPDF. (Threads would not help: PyMuPDF
+    holds the GIL and a document must not be shared across threads.)
+
+    Args:
+        doc (fitz.Document): Already opened document (used for page count / small PDFs).
+        pdf_path (str): Path to the same PDF, re-opened by each worker.
+        executor (Executor, optional): Long-lived process pool to reuse. If None,
+            the module's shared pool (`_default_page_pool`) is used.
+
+    Returns:
+        List[str]: One text string per page.
+    """
+    page_count = doc.page_count
+    workers = min(os.cpu_count() or 1, MAX_PAGE_WORKERS)
+    if page_count < PARALLEL_PAGE_THRESHOLD or workers < 2:
+        return [doc.load_page(i).get_text("text", flags=TEXT_FLAGS, sort=False) for i in range(page_count)]  # type: ignore
+
+    # Over-split into shorter contiguous ranges: workers that finish early pick up the
+    # next range, so pages of uneven cost (scans, dense tables) balance across the pool
+    step = max(MIN_RANGE_PAGES, -(-page_count // (workers * RANGES_PER_WORKER)))  # ceil division
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    return _run_ranges(executor or _default_page_pool(), pdf_path, ranges)
+
+
+@lru_cache(maxsize=1)
+def _default_page_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by callers that do not pass their own (Streamlit app, scripts).
+    Created on first large PDF and reused, so worker start-up is paid once per process.
+    """
+    pool = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, MAX_PAGE_WORKERS))
+    atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+
+def _run_ranges(executor: Executor, pdf_path: str, ranges: List[Tuple[int, int]]) -> List[str]:
+    """Submit one `_extract_range` task per page range and collect results in page order."""
+    futures = [executor.submit(_extract_range, pdf_path, start, end) for start, end in ranges]
+    texts: List[str] = []
+    for future in futures:  # submission order == page order
+        texts.extend(future.result())
+    return texts
+
+
+def _load_pdf_fitz(path: Path) -> List[Document]:
+    """
+    Load a PDF with PyMuPDF, one Document per page.
+    Much faster than the pypdf-based PyPDFLoader and keeps the same metadata keys.
+    MuPDF is native code like PDFium (pypdfium2), so switching engines would add a
+    dependency without moving extraction out of Python any further.
+    Large PDFs have their pages extracted in worker processes (see `extract_page_texts`).
+    """
+    with fitz.open(str(path)) as pdf:
+        texts = extract_page_texts(pdf, str(path))
+    return [Document(page_content=text, metadata={"source": str(path), "page": i}) for i, text in enumerate(texts)]
+
+
+# LangChain loaders are imported on first use, like the file types that need them
+def _load_docx(path: Path) -> List[Document]:
+    from langchain_community.document_loaders import Docx2txtLoader
+    return Docx2txtLoader(str(path)).load()
+
+
+def _load_txt(path: Path) -> List[Document]:
+    from langchain_community.document_loaders import TextLoader
+    return TextLoader(str(path), encoding="utf-8").load()
+
+
+# Loader per file extension (lowercase); keys match SUPPORTED_EXTENSIONS
+LOADERS: Dict[str, Callable[[Path], List[Document]]] = {
+    ".pdf": _load_pdf_fitz,
+    ".docx": _load_docx,
+    ".txt": _load_txt,
+}
+
+
+def _file_digest(p: Path) -> Tuple[int, str]:
+    """(size in bytes, XXH3-128 hex digest) of a file, hashed straight from a read-only mmap."""
+    with open(p, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return 0, xxhash.xxh3_128_hexdigest(b"")  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return size, xxhash.xxh3_128_hexdigest(mm)
+
+
+def _load_one(p: Path, load: Callable[[Path], List[Document]]) -> List[Document]:
+    """
+    Load a single file with its extension's loader (see `LOADERS`).
+    Every Document is stamped with the file's `content_hash` and `size`, so consumers
+    get a per-file cache key without reading the file again.
+    """
+    size, content_hash = _file_digest(p)
+    docs = load(p)
+    for d in docs:
+        d.metadata["content_hash"] = content_hash
+        d.metadata["size"] = size
+    return docs
 
 
 def load_documents(paths: Iterable[Path]) -> List[Document]:
     """
     Load documents from given file paths (PDF, DOCX, TXT).
     Automatically uses the right loader based on file extension.
+    Files are loaded concurrently in threads (overlapping file I/O); the CPU-bound
+    text extraction of large PDFs goes to worker processes. Output keeps the input order.
+    Every returned Document carries `metadata["source"]` (the file path), set by its loader,
+    plus the file's `content_hash` (XXH3-128 hex) and `size` in bytes.
+    Unsupported files are skipped and reported in one warning, counted per extension.
     """
     docs: List[Document] = []
     try:
+        files: List[Path] = []
+        loaders: List[Callable[[Path], List[Document]]] = []
+        skipped: Counter = Counter()
         for p in paths:
             ext = p.suffix.lower()
-
-            # Decide which loader to use based on file type
-            if ext == ".pdf":
-                loader = PyPDFLoader(str(p))
-            elif ext == ".docx":
-                loader = Docx2txtLoader(str(p))
-            elif ext == ".txt":
-                loader = TextLoader(str(p), encoding="utf-8")
-            else:
-                # Skip unsupported file types
-                log.warning("Unsupported extension skipped", path=str(p))
+            load = LOADERS.get(ext)
+            if load is None:
+                skipped[ext] += 1
                 continue
+            files.append(p)
+            loaders.append(load)
+        if skipped:
+            log.warning("Unsupported extensions skipped", counts=dict(skipped))
 
+        workers = max(1, min(os.cpu_count() or 1, MAX_LOAD_WORKERS, len(files)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
             # Add loaded pages (documents can have multiple pages)
-            docs.extend(loader.load())
+            for loaded in pool.map(_load_one, files, loaders):
+                docs.extend(loaded)
 
         log.info("Documents loaded", count=len(docs))
         return docs
@@ -44,35 +187,64 @@ def load_documents(paths: Iterable[Path]) -> List[Document]:
         raise DocumentPortalException("Error loading documents", e) from e
 
 
+def _write_sources(buf: TextIO, docs: List[Document]) -> None:
+    """
+    Write each document to `buf` under a `--- SOURCE: ... ---` header, newline-separated.
+    Header pieces and content are written separately: an f-string per document copies
+    every chunk once more (the old join measured ~5x slower on 5000 x 2.7 KB chunks).
+    """
+    for i, d in enumerate(docs):
+        # Documents from load_documents() always have "source": the fallbacks only run
+        # for documents built elsewhere
+        src = d.metadata.get("source") or d.metadata.get("file_path") or "unknown"
+        if i:
+            buf.write("\n")
+        buf.write("\n--- SOURCE: ")
+        buf.write(src)
+        buf.write(" ---\n")
+        buf.write(d.page_content)
+
+
 def concat_for_analysis(docs: List[Document]) -> str:
     """
     Combine multiple documents into a single text string,
     including their source info for easier analysis.
     """
-    parts = []
-    for d in docs:
-        # Try to find source info from metadata, fallback to "unknown"
-        src = d.metadata.get("source") or d.metadata.get("file_path") or "unknown"
-        parts.append(f"\n--- SOURCE: {src} ---\n{d.page_content}")
+    buf = io.StringIO()
+    _write_sources(buf, docs)
+    return buf.getvalue()
 
-    return "\n".join(parts)
 
-
-def concat_for_comparison(ref_docs: List[Document], act_docs: List[Document]) -> str:
+def concat_for_comparison(ref_docs: List[Document], act_docs: List[Document],
+                          out: Optional[TextIO] = None) -> Optional[str]:
     """
     Prepare text for comparing two sets of documents
     (e.g., reference vs actual).
+    Both sides go into one buffer, so the per-side strings are never materialized.
+
+    Args:
+        ref_docs (List[Document]): Reference documents.
+        act_docs (List[Document]): Actual documents.
+        out (TextIO, optional): Stream to write into instead (e.g. a request body or a
+            file), so the combined text never has to exist as one str.
+
+    Returns:
+        Optional[str]: The combined text, or None when written to `out`.
     """
-    left = concat_for_analysis(ref_docs)
-    right = concat_for_analysis(act_docs)
-    return f"<<REFERENCE_DOCUMENTS>>\n{left}\n\n<<ACTUAL_DOCUMENTS>>\n{right}"
+    buf = out if out is not None else io.StringIO()
+    buf.write("<<REFERENCE_DOCUMENTS>>\n")
+    _write_sources(buf, ref_docs)
+    buf.write("\n\n<<ACTUAL_DOCUMENTS>>\n")
+    _write_sources(buf, act_docs)
+    return None if out is not None else buf.getvalue()
 
 
 # ---------- Helpers ----------
 class FastAPIFileAdapter:
     """
     Adapter to make FastAPI's UploadFile work like
-    a simple file object with `.name` and `.getbuffer()`.
+    a simple file object with `.name`, `.file` and `.getbuffer()`.
+    `.file` exposes the underlying spooled file so it can be streamed to disk.
 
     Useful for reusing code that expects normal file objects.
     """
@@ -80,20 +252,32 @@ class FastAPIFileAdapter:
     def __init__(self, uf: UploadFile):
         self._uf = uf
         self.name = uf.filename
+        self.file = uf.file
+
+    def stream(self) -> BinaryIO:
+        """Return the underlying file rewound to the start, for incremental readers."""
+        self._uf.file.seek(0)  # rewind file pointer
+        return self._uf.file
 
     def getbuffer(self) -> bytes:
-        """Read all file contents as bytes."""
+        """
+        Read all file contents as bytes.
+
+        Loads the whole upload into memory; use `.file` / `stream()` to process large
+        uploads incrementally.
+        """
         self._uf.file.seek(0)  # rewind file pointer
         return self._uf.file.read()
 
 
-def read_pdf_via_handler(handler, path: str) -> str:
+def read_pdf_via_handler(handler, path: str, **kwargs) -> str:
     """
     Generic helper to read a PDF using a custom handler.
     Supports both `read_pdf` and `read_` methods.
+    Extra keyword args (e.g. `executor`) are forwarded to `read_pdf`.
     """
     if hasattr(handler, "read_pdf"):
-        return handler.read_pdf(path)  # type: ignore
+        return handler.read_pdf(path, **kwargs)  # type: ignore
     if hasattr(handler, "read_"):
         return handler.read_(path)  # type: ignore
     raise RuntimeError("DocHandler has neither read_pdf nor read_ method.")
@@ -0,0 +1,162 @@
+"""
+Module: embedding_cache.py
+
+Content-addressed on-disk cache in front of a LangChain embeddings model.
+Identical chunks (across sessions and re-ingests) are embedded only once.
+"""
+
+from __future__ import annotations
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+import numpy as np
+import xxhash
+from langchain_core.embeddings import Embeddings
+from logger import GLOBAL_LOGGER as log
+from utils.file_io import ensure_dir
+
+EMBED_BATCH_SIZE = 96  # stays under provider per-request limits
+EMBED_MAX_CONCURRENCY = 4  # embedding requests in flight at once
+
+Precision = Literal["fp32", "fp16", "sq8"]
+
+
+def _model_dir(model_name: Optional[str], dimensions: Optional[int]) -> str:
+    """Filesystem-safe cache subdirectory for a model, e.g. `models_gemini-embedding-001`."""
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name or "default").strip("._") or "default"
+    return f"{name}-d{dimensions}" if dimensions else name
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings adapter that caches document vectors on disk, keyed by a content hash (XXH3-128) of the text.
+
+    - Cache hits are read back from `<cache_dir>/<model>/<xxh3_128>.npy`; each model (and
+      output dimension) gets its own subdirectory, so switching `embedding_model` in
+      config.yaml never serves another model's vectors.
+    - Misses are embedded in batches of `batch_size` (up to `EMBED_MAX_CONCURRENCY`
+      requests in flight) and written to the cache.
+    - Query embeddings are not cached and go straight to the wrapped model.
+    - `precision` sets the stored dtype: "fp32", "fp16" (half the bytes) or "sq8"
+      (int8 plus a float32 per-vector scale, about a quarter). Vectors are always
+      returned as float lists, and fresh ones are returned exactly as they will read
+      back later, so an index built from a cold cache matches one built from a warm one.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache_dir: Path, batch_size: int = EMBED_BATCH_SIZE,
+                 precision: Precision = "fp32", model_name: Optional[str] = None,
+                 dimensions: Optional[int] = None):
+        """
+        Args:
+            embeddings (Embeddings): Underlying embedding model.
+            cache_dir (Path): Directory holding cached vectors (shared by all models).
+            batch_size (int): Max texts sent to the model per call.
+            precision (str): Storage dtype for new entries: "fp32", "fp16" or "sq8".
+                Existing entries are read back in whatever dtype they were written.
+            model_name (str, optional): Name of the embedding model; selects the cache subdirectory.
+            dimensions (int, optional): Output dimension, when the model is configured with one.
+        """
+        if precision not in ("fp32", "fp16", "sq8"):
+            raise ValueError(f"Unsupported embedding cache precision: {precision}")
+        self.precision = precision
+        self.embeddings = embeddings
+        self.cache_dir = ensure_dir(Path(cache_dir) / _model_dir(model_name, dimensions))
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _key(text: str) -> str:
+        """Content hash used as the cache key (same digest and encoding as the ingestion `_chunk_key`)."""
+        return xxhash.xxh3_128_hexdigest(text.encode("utf-8", "ignore"))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def _load(self, key: str) -> Optional[List[float]]:
+        """Return the cached vector for `key`, or None on a miss / unreadable entry."""
+        try:
+            return self._decode(np.load(self._path(key), mmap_mode="r"))
+        except FileNotFoundError:
+            return None  # miss: one failed open instead of a stat + open on hits
+        except Exception:
+            return None  # corrupt entry -> re-embed and overwrite
+
+    def _encode(self, vector: List[float]) -> np.ndarray:
+        """Array stored for `vector` at the configured precision."""
+        arr = np.asarray(vector, dtype=np.float32)
+        if self.precision == "fp16":
+            return arr.astype(np.float16)
+        if self.precision == "sq8":
+            # Symmetric per-vector scale; the float32 scale rides in the first 4 bytes
+            scale = np.float32(np.abs(arr).max() / 127.0) if arr.size else np.float32(0)
+            q = np.round(arr / scale).astype(np.int8) if scale else np.zeros(arr.shape, dtype=np.int8)
+            return np.concatenate([np.atleast_1d(scale).view(np.int8), q])
+        return arr
+
+    @staticmethod
+    def _decode(arr: np.ndarray) -> List[float]:
+        """Float vector from a stored array (dtype tells which precision wrote it)."""
+        if arr.dtype == np.int8:
+            scale = arr[:4].view(np.float32)[0]
+            return (arr[4:].astype(np.float32) * scale).tolist()
+        return arr.tolist()
+
+    def _store(self, key: str, vector: List[float]) -> List[float]:
+        """
+        Write a vector atomically so concurrent readers never see a partial file.
+        Returns the vector as it will be read back.
+        """
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        arr = self._encode(vector)
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, path)
+        return vector if self.precision == "fp32" else self._decode(arr)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, serving repeated texts from the on-disk cache.
+
+        Args:
+            texts (List[str]): Texts to embed.
+
+        Returns:
+            List[List[float]]: One vector per input text, in input order.
+        """
+        keys = [self._key(t) for t in texts]
+        vectors: List[Optional[List[float]]] = [self._load(k) for k in keys]
+
+        # Group misses by key so duplicate texts within one call are embedded once
+        pending: Dict[str, List[int]] = {}
+        for i, v in enumerate(vectors):
+            if v is None:
+                pending.setdefault(keys[i], []).append(i)
+
+        miss_keys = list(pending)
+        batches = [miss_keys[start:start + self.batch_size] for start in range(0, len(miss_keys), self.batch_size)]
+
+        def embed_batch(batch: List[str]) -> List[List[float]]:
+            return self.embeddings.embed_documents([texts[pending[k][0]] for k in batch])
+
+        # Requests are network-bound, so overlap them instead of waiting for each round-trip
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(EMBED_MAX_CONCURRENCY, len(batches))) as pool:
+                results = list(pool.map(embed_batch, batches))
+        else:
+            results = [embed_batch(b) for b in batches]
+
+        for batch, embedded in zip(batches, results):
+            for k, vector in zip(batch, embedded):
+                vector = self._store(k, vector)
+                for i in pending[k]:
+                    vectors[i] = vector
+
+        log.info("Embeddings resolved", total=len(texts), cache_hits=len(texts) - sum(map(len, pending.values())),
+                 embedded=len(miss_keys))
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query (uncached)."""
+        return self.embeddings.embed_query(text)
@@ -0,0 +1,193 @@
+"""
+Module: faiss_store.py
+
+Pickle-free persistence for LangChain FAISS vector stores.
+
+- `<name>.<generation>.faiss`: the ANN index, written with `faiss.write_index`.
+- `<name>.<generation>.docstore.json`: documents in index order (orjson), replacing
+  the `<name>.pkl` pickle written by `FAISS.save_local`.
+- `<name>.current`: the generation readers should open. Each save writes a new
+  generation and then swaps this pointer with one rename, so index and docstore
+  always change together.
+
+Indexes saved by older versions (`<name>.faiss` + `<name>.docstore.json` / `.pkl`,
+no pointer) are still readable.
+"""
+
+from __future__ import annotations
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+import faiss
+import orjson
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+
+_SAVE_LOCK = threading.Lock()  # serializes pointer swaps + cleanup between threads of one process
+_IN_FLIGHT: Set[str] = set()  # generations being written by this process, never cleaned up
+
+
+def _temp_name(path: Path) -> Path:
+    """Temporary sibling of `path`, unique per process and thread."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _current_generation(base: Path, index_name: str) -> Optional[str]:
+    """Generation named by `<index_name>.current`, or None for a legacy / missing index."""
+    try:
+        return (base / f"{index_name}.current").read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _generation_files(base: Path, index_name: str, generation: str) -> Tuple[Path, Path]:
+    return base / f"{index_name}.{generation}.faiss", base / f"{index_name}.{generation}.docstore.json"
+
+
+def _remove_generations(base: Path, index_name: str, keep: Set[Optional[str]]) -> None:
+    """
+    Delete saved generations not in `keep` (None stands for the legacy, pointer-less files).
+    The previous generation is kept so a reader that just read the old pointer can still open it.
+    """
+    stale: List[Path] = []
+    for suffix in (".faiss", ".docstore.json"):
+        for path in base.glob(f"{index_name}.*{suffix}"):
+            generation = path.name[len(index_name) + 1:-len(suffix)]
+            if generation and generation not in keep:
+                stale.append(path)
+    if None not in keep:
+        stale += [base / f"{index_name}.faiss", base / f"{index_name}.docstore.json", base / f"{index_name}.pkl"]
+    for path in stale:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def index_files(folder: Path | str, index_name: str = "index") -> Tuple[Path, Path]:
+    """Return the (index, docstore) paths for `index_name` in `folder`, preferring the JSON docstore."""
+    base = Path(folder)
+    generation = _current_generation(base, index_name)
+    if generation is not None:
+        return _generation_files(base, index_name, generation)
+    docstore = base / f"{index_name}.docstore.json"
+    if not docstore.exists() and (base / f"{index_name}.pkl").exists():
+        docstore = base / f"{index_name}.pkl"  # legacy FAISS.save_local layout
+    return base / f"{index_name}.faiss", docstore
+
+
+def _mmap_flags(index_path: Path) -> int:
+    """
+    Read-only mmap flags for the index type stored at `index_path`.
+
+    IVF indexes ("Iw..." fourcc) map their inverted lists with IO_FLAG_MMAP; flat-code
+    indexes (flat / SQ / PQ) need IO_FLAG_MMAP_IFC, since IO_FLAG_MMAP alone still
+    copies their codes into RAM.
+    """
+    with open(index_path, "rb") as f:
+        fourcc = f.read(4)
+    if fourcc.startswith(b"Iw"):
+        mmap_flag = faiss.IO_FLAG_MMAP
+    else:
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)  # IFC needs faiss >= 1.11
+    return mmap_flag | faiss.IO_FLAG_READ_ONLY
+
+
+def index_exists(folder: Path | str, index_name: str = "index") -> bool:
+    """True if both the index and a docstore are present."""
+    return all(p.exists() for p in index_files(folder, index_name))
+
+
+def save_vectorstore(vs: FAISS, folder: Path | str, index_name: str = "index") -> None:
+    """
+    Persist `vs` as a new generation of `<index_name>.<generation>.faiss` +
+    `<index_name>.<generation>.docstore.json`, then point `<index_name>.current` at it.
+
+    Both files are complete before the pointer moves, and the pointer moves with a
+    single rename, so a reader (or a crash at any point) sees either the old pair
+    or the new pair, never a mix. Generations older than the previous one are removed.
+
+    Args:
+        vs (FAISS): Vector store to save.
+        folder (Path | str): Target directory (must exist).
+        index_name (str): Base file name. Defaults to "index".
+    """
+    base = Path(folder)
+    rows: List[Dict[str, Any]] = []
+    for pos in range(len(vs.index_to_docstore_id)):
+        doc_id = vs.index_to_docstore_id[pos]
+        doc = vs.docstore.search(doc_id)
+        rows.append({"id": doc_id, "page_content": doc.page_content, "metadata": doc.metadata})
+
+    # Unique per save: nothing reads these names until the pointer says so
+    generation = f"{time.time_ns():x}-{os.getpid()}-{threading.get_ident()}"
+    index_path, docstore_path = _generation_files(base, index_name, generation)
+    with _SAVE_LOCK:
+        _IN_FLIGHT.add(generation)
+    try:
+        faiss.write_index(vs.index, str(index_path))
+        docstore_path.write_bytes(orjson.dumps(rows, default=str))
+
+        pointer = base / f"{index_name}.current"
+        tmp_pointer = _temp_name(pointer)
+        with _SAVE_LOCK:
+            previous = _current_generation(base, index_name)
+            tmp_pointer.write_text(generation, encoding="utf-8")
+            os.replace(tmp_pointer, pointer)
+            _IN_FLIGHT.discard(generation)
+            _remove_generations(base, index_name, keep={generation, previous, *_IN_FLIGHT})
+    finally:
+        with _SAVE_LOCK:
+            _IN_FLIGHT.discard(generation)
+
+
+def load_vectorstore(folder: Path | str, embeddings: Embeddings, index_name: str = "index",
+                     mmap: bool = False) -> FAISS:
+    """
+    Load a vector store written by `save_vectorstore` (or by `FAISS.save_local`).
+
+    Args:
+        folder (Path | str): Directory holding the index files.
+        embeddings (Embeddings): Embedding function for queries / additions.
+        index_name (str): Base file name. Defaults to "index".
+        mmap (bool): Memory-map the index read-only instead of reading it into RAM.
+            The returned store can then only be searched, not extended.
+
+    Returns:
+        FAISS: Loaded vector store.
+
+    Raises:
+        ValueError: If the index and docstore disagree on the number of vectors.
+    """
+    index_path, docstore_path = index_files(folder, index_name)
+    index = faiss.read_index(str(index_path), _mmap_flags(index_path) if mmap else 0)
+
+    if docstore_path.suffix == ".json":
+        rows = orjson.loads(docstore_path.read_bytes())
+        docstore = InMemoryDocstore({
+            r["id"]: Document(id=r["id"], page_content=r["page_content"], metadata=r["metadata"]) for r in rows
+        })
+        index_to_docstore_id = {pos: r["id"] for pos, r in enumerate(rows)}
+    else:
+        # Same trust model as FAISS.load_local(allow_dangerous_deserialization=True): only our own legacy indexes
+        with open(docstore_path, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+    if index.ntotal != len(index_to_docstore_id):
+        raise ValueError(
+            f"FAISS index and docstore out of sync in {folder}: "
+            f"{index.ntotal} vectors, {len(index_to_docstore_id)} documents"
+        )
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
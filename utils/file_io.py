@@ -5,14 +5,23 @@ import json
 import uuid
 import hashlib
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from utils.model_loader import ModelLoader
-from logger.custom_logger import CustomLogger
-from exception.custom_exception_archive import DocumentPortalException
-log = CustomLogger().get_logger(__name__)
+from logger import get_logger
+from exception.custom_exception import DocumentPortalException
+log = get_logger(__name__)
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB chunks when streaming uploads to disk
+STREAM_THRESHOLD = 8 << 20  # buffer-only uploads at/above this are written in COPY_BUFFER_SIZE slices
+MAX_WRITE_WORKERS = 4
+MAX_CACHED_DIRS = 1024  # created-directory entries remembered (one or two per session)
+_CREATED_DIRS: "OrderedDict[str, None]" = OrderedDict()  # directories this process already created (LRU)
+_CREATED_DIRS_LOCK = threading.Lock()
 
 # ----------------------------- #
 # Helpers (file I/O + loading)  #
@@ -20,11 +29,75 @@ SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 def generate_session_id(prefix: str = "session") -> str:
     return f"{prefix}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
+def ensure_dir(path: Path | str) -> Path:
+    """
+    Create `path` (and parents) once per process; later calls skip the mkdir syscall.
+    Only the `MAX_CACHED_DIRS` most recently used paths are remembered, so a long-running
+    server does not accumulate one entry per session forever.
+    """
+    p = Path(path)
+    key = str(p)
+    with _CREATED_DIRS_LOCK:
+        if key in _CREATED_DIRS:
+            _CREATED_DIRS.move_to_end(key)
+            return p
+    p.mkdir(parents=True, exist_ok=True)
+    with _CREATED_DIRS_LOCK:
+        _CREATED_DIRS[key] = None
+        if len(_CREATED_DIRS) > MAX_CACHED_DIRS:
+            _CREATED_DIRS.popitem(last=False)  # evicted paths just mkdir again if reused
+    return p
+
+def forget_dir(path: Path | str) -> None:
+    """Drop `path` from the ensure_dir cache (call after deleting the directory)."""
+    with _CREATED_DIRS_LOCK:
+        _CREATED_DIRS.pop(str(Path(path)), None)
+
+def write_uploaded_file(uploaded_file, out: Path | str) -> None:
+    """
+    Stream an uploaded file to `out` in fixed-size chunks, so peak memory stays
+    around one buffer instead of the whole file.
+
+    Accepts FastAPI adapters (`.file`), Streamlit/plain file objects (`.read`),
+    and falls back to `.getbuffer()` for buffer-only objects.
+    """
+    stream = getattr(uploaded_file, "file", None)
+    if stream is None and hasattr(uploaded_file, "read"):
+        stream = uploaded_file
+    with open(out, "wb") as f:
+        if stream is None:
+            # Buffer-only objects: the bytes are already in memory, so write zero-copy
+            # memoryview slices (one write for small files, 1 MiB pieces above the threshold)
+            buf = memoryview(uploaded_file.getbuffer())
+            if buf.nbytes < STREAM_THRESHOLD:
+                f.write(buf)
+                return
+            for start in range(0, buf.nbytes, COPY_BUFFER_SIZE):
+                f.write(buf[start:start + COPY_BUFFER_SIZE])
+            return
+        if getattr(stream, "seekable", lambda: False)():
+            stream.seek(0)  # Streamlit may have already consumed the buffer
+        shutil.copyfileobj(stream, f, length=COPY_BUFFER_SIZE)
+
+def write_uploaded_files(jobs: List[Tuple[Any, Path]]) -> None:
+    """
+    Write several uploads at once: every (uploaded file, destination) pair is submitted
+    to a small thread pool together, so their disk writes overlap instead of queueing.
+    """
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(jobs))) as pool:
+        # list() drains the iterator so any write error is raised here
+        list(pool.map(lambda job: write_uploaded_file(*job), jobs))
+
 def save_uploaded_files(uploaded_files: Iterable, target_dir: Path) -> List[Path]:
-    """Save uploaded files (Streamlit-like) and return local paths."""
+    """
+    Save uploaded files (Streamlit-like) and return local paths.
+    All writes are submitted together to a small thread pool instead of one after another.
+    """
     try:
-        target_dir.mkdir(parents=True, exist_ok=True)
-        saved: List[Path] = []
+        ensure_dir(target_dir)
+        jobs = []  # (uploaded file, original name, destination)
         for uf in uploaded_files:
             name = getattr(uf, "name", "file")
             ext = Path(name).suffix.lower()
@@ -32,12 +105,12 @@ def save_uploaded_files(uploaded_files: Iterable, target_dir: Path) -> List[Path
                 log.warning("Unsupported file skipped", filename=name)
                 continue
             fname = f"{uuid.uuid4().hex[:8]}{ext}"
-            out = target_dir / fname
-            with open(out, "wb") as f:
-                if hasattr(uf, "read"):
-                    f.write(uf.read())
-                else:
-                    f.write(uf.getbuffer())  # fallback
+            jobs.append((uf, name, target_dir / fname))
+
+        write_uploaded_files([(uf, out) for uf, _, out in jobs])
+
+        saved: List[Path] = []
+        for _, name, out in jobs:
             saved.append(out)
             log.info("File saved for ingestion", uploaded=name, saved_as=str(out))
         return saved
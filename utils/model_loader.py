@@ -1,68 +1,109 @@
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from dotenv import load_dotenv
 from utils.config_loader import load_config
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_groq import ChatGroq
+import httpx
+from groq import DefaultAsyncHttpxClient, DefaultHttpxClient
 # from langchain_openai import ChatOpenAI
-from logger.custom_logger import CustomLogger
-from exception.custom_exception_archive import DocumentPortalException
+from logger import get_logger
+from exception.custom_exception import DocumentPortalException
 
 # create logger
-log = CustomLogger().get_logger(__name__)
+log = get_logger(__name__)
+
+REQUIRED_API_KEYS = ("GOOGLE_API_KEY", "GROQ_API_KEY")
+HTTP_KEEPALIVE_EXPIRY = 300  # seconds an idle Groq connection stays open (SDK default of 5 drops it between chat turns)
+
+
+def _wrap_errors(message: str):
+    """
+    Decorator: log and re-raise any failure as DocumentPortalException(`message`).
+    DocumentPortalExceptions pass through unchanged; the happy path costs one call.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except DocumentPortalException:
+                raise
+            except Exception as e:
+                log.error(message, error=str(e))
+                raise DocumentPortalException(message, e) from e
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=1)
+def _get_api_keys() -> dict:
+    """
+    Loads `.env` and validates that the required API keys are set (once per process).
+    Raises a custom exception if any are missing; a failed check is not cached.
+    """
+    load_dotenv()  # load environment variables from .env file
+
+    # Collect all API keys into dictionary
+    api_key = {key: os.getenv(key) for key in REQUIRED_API_KEYS}
+
+    # Check which ones are missing
+    missing = [k for k, v in api_key.items() if not v]
+
+    if missing:
+        log.error("Missing required environment variables: {}".format(missing))
+        raise DocumentPortalException("Missing required environment variables: {}".format(missing), sys)
+
+    log.info("Environment variables validated", available_key=list(api_key))
+    return api_key
 
 class ModelLoader:
     """
     A helper class to load environment variables, configuration,
     embeddings, and LLM (Large Language Models) based on settings.
+
+    The loader is a process-wide singleton: `ModelLoader()` always returns the same
+    instance, and the embedding / LLM clients it creates are cached on it.
     """
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
     def __init__(self):
         """
-        Initializes the ModelLoader:
-        - Loads environment variables from `.env`
-        - Validates required API keys
+        Initializes the ModelLoader (first call only):
+        - Reads and validates the required API keys (see `_get_api_keys`)
         - Loads configuration from `config.yaml`
         """
-        load_dotenv()  # load environment variables from .env file
-        self._validate_env()
-        self.config = load_config()
+        with ModelLoader._instance_lock:
+            if self._initialized:
+                return
+            _get_api_keys()  # fail fast on missing keys; the client builders look them up themselves
+            self.config = load_config()
+            self._initialized = True
         log.info("Configuration loaded Successfully", config_keys=list(self.config.keys()))
 
-    def _validate_env(self):
-        """
-        Validates that required environment variables are set.
-        Raises a custom exception if any are missing.
-        """
-        required_vars = ["GOOGLE_API_KEY", "GROQ_API_KEY"]
-
-        # Collect all API keys into dictionary
-        self.api_key = {key: os.getenv(key) for key in required_vars}
-
-        # Check which ones are missing
-        missing = [k for k, v in self.api_key.items() if not v]
-
-        if missing:
-            log.error("Missing required environment variables: {}".format(missing))
-            raise DocumentPortalException("Missing required environment variables: {}".format(missing), sys)
-
-        log.info("Environment variables validated",
-                 available_key=[k for k in self.api_key.keys() if self.api_key[k]])
-
+    @_wrap_errors("Fail to load embedding model")
     def load_embeddings(self):
         """
         Loads and returns the Google Generative AI Embedding model
-        (used to convert text into vector embeddings).
+        (used to convert text into vector embeddings), cached per model name.
         """
-        try:
-            log.info("Loading Google Generative AI embeddings...")
-            model_name = self.config["embedding_model"]["model_name"]
-            return GoogleGenerativeAIEmbeddings(model=model_name)
-        except Exception as e:
-            log.error("Failed to load Google Generative AI embeddings: {}".format(e))
-            raise DocumentPortalException("Fail to load embedding model", sys)
+        model_name = self.config["embedding_model"]["model_name"]
+        return _build_embeddings(model_name)
 
+    @_wrap_errors("Fail to load LLM")
     def load_llm(self, model_name="google"):
         """
         Loads and returns an LLM (Large Language Model) based on provider (Google or Groq).
@@ -71,16 +112,20 @@ class ModelLoader:
             model_name (str): The key for which LLM provider to load (default: "google")
 
         Returns:
-            LLM object (ChatGoogleGenerativeAI or ChatGroq)
+            LLM object (ChatGoogleGenerativeAI or ChatGroq), cached per (provider, model, temperature)
+
+        Settings are resolved from config on every call (well under a microsecond); the
+        client itself is built once by `_build_llm`, so there is nothing worth pre-binding.
+
+        Raises:
+            DocumentPortalException: Unknown provider key / provider, or client creation failed.
         """
         # get config block for llm
         llm_block = self.config["llm"]
-        log.info("Loading LMM models...")
 
         # check if provider is available in config.yaml
         provider_key = model_name
         if provider_key not in llm_block:
-            log.error("LLM provider not found in config", provider_key=provider_key)
             raise ValueError(f"LLM provider not found in config: {provider_key}")
 
         # read llm config values
@@ -88,51 +133,109 @@ class ModelLoader:
         provider = llm_config.get("provider")
         model_name = llm_config.get("model_name")
         temperature = llm_config.get("temperature")
-        max_tokens = llm_config.get("max_tokens")
-
-        log.info("Loading LMM models...", provider=provider, model_name=model_name,
-                 temperature=temperature, max_tokens=max_tokens)
-
-        # choose provider
-        if provider == "groq":
-            # load groq llm
-            llm = ChatGroq(
-                model=model_name,
-                api_key=self.api_key["GROQ_API_KEY"],
-                temperature=temperature,
-            )
-            return llm
-
-        elif provider == "google":
-            # load google llm
-            llm = ChatGoogleGenerativeAI(
-                model=model_name,
-                temperature=temperature,
-                google_api_key=self.api_key["GOOGLE_API_KEY"],
-            )
-            return llm
-
-        else:
-            log.error("Unknown provider", provider=provider)
+
+        if provider not in ("groq", "google"):
             raise ValueError(f"Unknown provider: {provider}")
+        return _build_llm(provider, model_name, temperature)
 
 
-if __name__ == "__main__":
-    # create loader
-    loader = ModelLoader()
+# Clients are cached on their settings, not on the raw API key: keys are looked up
+# inside, so they are never part of a cache key (or its repr).
+@lru_cache(maxsize=8)
+def _build_embeddings(model_name: str):
+    """Create the embedding client for `model_name` (once per process)."""
+    log.info("Loading Google Generative AI embeddings...", model_name=model_name)
+    return GoogleGenerativeAIEmbeddings(model=model_name)
 
-    # Test embeddings model
-    embedding_model = loader.load_embeddings()
-    print(f"Embedding model loaded: {embedding_model}")
 
-    # test embedding by converting text into vectors
-    result = embedding_model.embed_query("Hello World")
-    print(f"Embedding Result: {result}")
+@lru_cache(maxsize=1)
+def _groq_http_clients():
+    """
+    Process-wide (sync, async) httpx clients for Groq, shared by every ChatGroq we build.
+    Same timeouts / pool size as the SDK defaults, but idle connections are kept long
+    enough to be reused by the next question instead of paying a new TLS handshake.
+    """
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+    return DefaultHttpxClient(limits=limits), DefaultAsyncHttpxClient(limits=limits)
+
+
+@lru_cache(maxsize=8)
+def _build_llm(provider: str, model_name: str, temperature: float):
+    """Create the chat client for (`provider`, `model_name`, `temperature`) (once per process)."""
+    log.info("Loading LMM models...", provider=provider, model_name=model_name, temperature=temperature)
+    if provider == "groq":
+        # load groq llm
+        http_client, http_async_client = _groq_http_clients()
+        return ChatGroq(
+            model=model_name,
+            api_key=_get_api_keys()["GROQ_API_KEY"],
+            temperature=temperature,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+    # load google llm (gRPC: one long-lived, multiplexed channel per cached client)
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=temperature,
+        google_api_key=_get_api_keys()["GOOGLE_API_KEY"],
+    )
+
+
+def clear_model_cache() -> None:
+    """Drop cached embedding / LLM clients (e.g. in tests or after changing config / keys)."""
+    _build_embeddings.cache_clear()
+    _build_llm.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_loader() -> ModelLoader:
+    """
+    Return the process-wide ModelLoader, created on first use.
+    Lets per-session objects share one loader (and its cached clients) without
+    going through the singleton lock on every construction.
+    """
+    return ModelLoader()
+
+
+def get_embeddings():
+    """
+    Return the process-wide embedding model, created on first use.
+    Avoids re-reading config and re-creating the client on every request.
+    """
+    return get_loader().load_embeddings()
+
 
-    # Test the LLM loading based on YAML config
-    llm = loader.load_llm()
+def get_llm(model_name: str = "google"):
+    """
+    Return the process-wide LLM client for `model_name`, created on first use.
+    Lets chains built from it be shared across sessions.
+    """
+    return get_loader().load_llm(model_name=model_name)
+
+
+def preload_models(model_name: str = "google"):
+    """
+    Build the shared embedding model and LLM client up front, so the first request
+    does not pay for it. Later get_embeddings() / get_llm() calls hit the cache.
+
+    Construction is local (no API round trip), so the two are built in turn. Call this
+    from a thread that has an event loop available (e.g. the main thread): the
+    Google embeddings client opens an async gRPC channel when it is created.
+
+    Returns:
+        tuple: (embeddings, llm)
+    """
+    return get_embeddings(), get_llm(model_name)
+
+
+if __name__ == "__main__":
+    embedding_model, llm = preload_models()
+    print(f"Embedding model loaded: {embedding_model}")
     print(f"LMM model loaded: {llm}")
 
-    # test the model by invoking it with a simple query
-    result = llm.invoke("Hello World")
-    print(f"LLM Result: {result.content}")
+    # The two test calls are independent network round trips: overlap them
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        embedding = pool.submit(embedding_model.embed_query, "Hello World")
+        answer = pool.submit(llm.invoke, "Hello World")
+        print(f"Embedding Result: {embedding.result()}")
+        print(f"LLM Result: {answer.result().content}")
@@ -0,0 +1,38 @@
+"""
+Module: output_parsers.py
+
+JSON output parser with an orjson fast path for complete LLM responses.
+"""
+
+from __future__ import annotations
+from typing import Any, List
+import orjson
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.outputs import Generation
+
+
+def _strip_fence(text: str) -> str:
+    """Return the body of a response that is exactly one ```json fenced block (else `text`)."""
+    if len(text) >= 6 and text.startswith("```") and text.endswith("```"):
+        body = text[3:-3]
+        return body[4:] if body.startswith("json") else body
+    return text
+
+
+class FastJsonOutputParser(JsonOutputParser):
+    """
+    Drop-in JsonOutputParser that decodes complete responses with orjson.
+
+    Responses that are plain JSON or a single fenced JSON block are decoded in C;
+    anything else (surrounding prose, partial streaming chunks, invalid JSON)
+    falls back to LangChain's markdown-aware parser, so error handling and
+    format instructions are unchanged.
+    """
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Any:
+        if not partial:
+            try:
+                return orjson.loads(_strip_fence(result[0].text.strip()))
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse_result(result, partial=partial)